@@ -1,10 +1,18 @@
 """Keycloak OIDC authentication."""
 
+import logging
+from dataclasses import dataclass
+
 from authlib.integrations.starlette_client import OAuth
 from starlette.requests import Request
 
 from .config import Config
 
+logger = logging.getLogger(__name__)
+
+# The only userinfo claims the app reads; the session cookie carries just these
+SESSION_USER_CLAIMS = ("sub", "name", "preferred_username", "email")
+
 
 def create_oauth(config: Config) -> OAuth:
     """Create OAuth client configured for Keycloak.
@@ -34,8 +42,50 @@ def create_oauth(config: Config) -> OAuth:
     return oauth
 
 
+async def prefetch_jwks(oauth: OAuth):
+    """Warm the Keycloak signing keyset so the first login skips the /certs round-trip.
+
+    Endpoints are registered explicitly, so authlib never fetches the discovery document.
+    The keyset is fetched lazily on the first id_token verification and then kept on the
+    client for the process lifetime (authlib refetches it on its own if it sees an unknown kid).
+    """
+    try:
+        await oauth.keycloak.fetch_jwk_set()
+        logger.info("Fetched Keycloak JWKS")
+    except Exception as e:
+        # Keycloak may still be starting; the keyset will be fetched on first login instead
+        logger.warning(f"Could not prefetch Keycloak JWKS: {e}")
+
+
+def session_user_claims(user_info: dict) -> dict:
+    """Reduce OIDC userinfo to the claims stored in the session cookie."""
+    return {claim: user_info[claim] for claim in SESSION_USER_CLAIMS if claim in user_info}
+
+
+@dataclass(frozen=True)
+class SessionUser:
+    """The logged-in user, read from the session once per request."""
+
+    id: str | None
+    name: str | None
+
+
+def get_session_user(request: Request) -> SessionUser | None:
+    """Get the session user with ID and display name resolved, or None if not logged in."""
+    user = get_user_from_session(request)
+    if not user:
+        return None
+    return SessionUser(
+        id=user.get("sub"),
+        name=user.get("name") or user.get("preferred_username") or user.get("email"),
+    )
+
+
 def get_user_from_session(request: Request) -> dict | None:
-    """Get user info from session."""
+    """Get user info from session (or from request.state, once require_auth has resolved it)."""
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
     return request.session.get("user")
 
 
@@ -53,11 +103,3 @@ def get_user_email(request: Request) -> str | None:
     if user:
         return user.get("email")
     return None
-
-
-def get_user_name(request: Request) -> str | None:
-    """Get user display name from session."""
-    user = get_user_from_session(request)
-    if user:
-        return user.get("name") or user.get("preferred_username") or user.get("email")
-    return None
@@ -1,13 +1,18 @@
 """Chat logic with Claude API and MCP tools."""
 
-import json
+import asyncio
 import logging
+import random
 import re
+import time
 from collections.abc import Callable
 from typing import Any
 
 import anthropic
+import httpx
+import orjson
 
+from .database import Database
 from .mcp_client import McpClient
 
 logger = logging.getLogger(__name__)
@@ -35,6 +40,28 @@ then pass the results to `tool_render_plotly`. If the user provides their own da
 
 Be concise and helpful. When presenting data, format it clearly."""
 
+# Titles are generated off the interactive path via the Message Batches API (half the cost,
+# results typically within minutes), so a cheap model is plenty.
+TITLE_MODEL = "claude-haiku-4-5-20251001"
+TITLE_BATCH_INTERVAL = 60  # seconds between title batch submissions/polls
+TITLE_MAX_LENGTH = 80
+
+TITLE_PROMPT = """\
+Write a short title (at most 8 words) for a conversation that starts with the exchange below. \
+Reply with the title only, without quotes."""
+
+# Client-side rate limiting: retries for 429s that survive the SDK's own retries
+RATE_LIMIT_MAX_RETRIES = 3
+RATE_LIMIT_BASE_DELAY = 2  # seconds, doubled per retry
+RATE_LIMIT_SMOOTHING = 0.5  # weight of the server-reported remaining budget vs the local estimate
+
+# Prompt caching marker for the invariant prefix (tools + system prompt)
+EPHEMERAL_CACHE = {"type": "ephemeral"}
+PROMPT_CACHE_TTL = 300  # seconds an ephemeral cache entry lives after its last use
+
+# A chart URL field with a string value, e.g. "html_url": "https://..."
+CHART_URL_RE = re.compile(r'"(?:html_url|chart_url)"\s*:\s*"')
+
 
 def extract_chart_url(text: str) -> str | None:
     """Extract chart URL from a JSON object in text content.
@@ -48,8 +75,12 @@ def extract_chart_url(text: str) -> str | None:
     Returns:
         The chart URL if found, None otherwise.
     """
+    # Most tool output is not chart JSON: one regex scan (in C, stopping at the first hit)
+    # rules it out, and only candidates are parsed to confirm the shape and pick html_url
+    if not CHART_URL_RE.search(text):
+        return None
     try:
-        data = json.loads(text)
+        data = orjson.loads(text)
         if isinstance(data, dict):
             # New format: prefer html_url for interactive charts
             if "html_url" in data:
@@ -57,17 +88,129 @@ def extract_chart_url(text: str) -> str | None:
             # Legacy format
             if "chart_url" in data:
                 return data["chart_url"]
-    except (json.JSONDecodeError, TypeError):
+    except (orjson.JSONDecodeError, TypeError):
         pass
     return None
 
 
+def create_anthropic_client(api_key: str) -> anthropic.AsyncAnthropic:
+    """Create the Anthropic client shared by all requests.
+
+    One pooled HTTP/2 connection set is reused across conversations, so requests skip the
+    TCP/TLS handshake and concurrent calls multiplex over the same connection.
+    """
+    http_client = anthropic.DefaultAsyncHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60),
+        timeout=httpx.Timeout(connect=5, read=120, write=30, pool=10),
+    )
+    return anthropic.AsyncAnthropic(api_key=api_key, http_client=http_client)
+
+
+def _to_int(value: str | None) -> int | None:
+    """Parse an integer header value, returning None if missing or malformed."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _jsonable(obj: Any) -> Any:
+    """orjson.dumps fallback for SDK content blocks."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
+
+
+def estimate_tokens(payload: Any) -> int:
+    """Rough input-token estimate (~4 characters per token) for rate limiting."""
+    return len(orjson.dumps(payload, default=_jsonable)) // 4
+
+
+class AsyncTokenBucket:
+    """Input-token budget shared by all requests, so bursts wait instead of hitting 429s.
+
+    The bucket refills continuously at rate_per_min / 60 tokens per second, like Anthropic's
+    own limiter. Until a rate is known (from the first response's rate limit headers) it
+    doesn't limit at all.
+    """
+
+    def __init__(self, rate_per_min: float | None = None, burst: float | None = None):
+        self.rate_per_min = rate_per_min
+        self.capacity = burst or rate_per_min or 0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate_per_min:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate_per_min / 60)
+        self._updated = now
+
+    async def acquire(self, estimated_tokens: int):
+        """Wait until the estimated tokens fit in the budget, then spend them."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if not self.rate_per_min:
+                    return
+                # A request larger than the whole bucket waits for a full bucket rather than forever
+                needed = min(estimated_tokens, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= needed
+                    return
+                await asyncio.sleep((needed - self.tokens) * 60 / self.rate_per_min)
+
+    def update(self, rate_limit_info: dict):
+        """Adjust to the limit and remaining budget reported by the API."""
+        limit = _to_int(rate_limit_info.get("input_tokens_limit"))
+        remaining = _to_int(rate_limit_info.get("input_tokens_remaining"))
+        if not limit:
+            return
+        self._refill()
+        if not self.rate_per_min:
+            self.tokens = limit if remaining is None else remaining
+        self.rate_per_min = limit
+        self.capacity = limit
+        if remaining is not None:
+            # Decay toward the server's view, which also accounts for usage we didn't estimate
+            self.tokens += (remaining - self.tokens) * RATE_LIMIT_SMOOTHING
+        self.tokens = min(self.tokens, self.capacity)
+
+    def drain(self):
+        """Empty the bucket after a 429 so other requests back off too."""
+        self._refill()
+        self.tokens = 0
+
+
+def _rate_limited_input_tokens(usage: Any) -> int:
+    """Input tokens of a request that count toward the input-tokens-per-minute limit.
+
+    Prompt-cache reads don't count; uncached input and cache writes do.
+    """
+    return usage.input_tokens + (usage.cache_creation_input_tokens or 0)
+
+
+def _cancel_tools(pending_tools: list[tuple[Any, asyncio.Task]]):
+    """Cancel tool calls started during a stream whose results will not be used."""
+    for _, task in pending_tools:
+        task.cancel()
+
+
 class ChatService:
     """Service for handling chat interactions with Claude and MCP tools."""
 
-    def __init__(self, anthropic_api_key: str, mcp_client: McpClient):
-        self.client = anthropic.AsyncAnthropic(api_key=anthropic_api_key)
+    def __init__(self, client: anthropic.AsyncAnthropic, mcp_client: McpClient):
+        self.client = client
         self.mcp_client = mcp_client
+        self.rate_limiter = AsyncTokenBucket()
+        self._tools_cached: list[dict] | None = None
+        self._tools_version = 0
+        self._system_cached: tuple[str, list[dict]] | None = None
+        self._prefix_tokens_cached: tuple[tuple[str, int], int] | None = None
+        # (model, system_prompt, tools_version) whose prefix is in the prompt cache, and until when
+        self._prefix_warm: tuple[tuple[str, str, int], float] | None = None
 
     async def send_message(
         self,
@@ -75,108 +218,66 @@ class ChatService:
         model: str | None = None,
         system_prompt: str | None = None,
         on_tool_call: Callable[[str, Any], None] | None = None,
+        on_text: Callable[[str], None] | None = None,
     ) -> dict:
         """
         Send a message to Claude with MCP tools available.
 
+        Responses are streamed, and a turn's tool calls start concurrently as soon as the stream
+        reports it stopped for tool use, without waiting for the final message.
+
         Args:
             messages: Conversation history in Claude format
             model: Claude model to use (defaults to DEFAULT_MODEL)
             system_prompt: System prompt to use (defaults to DEFAULT_SYSTEM_PROMPT)
             on_tool_call: Optional callback when a tool is called (for streaming updates)
+            on_text: Optional callback for each text delta as it arrives (for streaming updates)
 
         Returns:
-            Assistant's response with content and any tool calls made
+            Assistant's response with content (text of every turn) and any tool calls made
         """
         model = model or DEFAULT_MODEL
         system_prompt = system_prompt or DEFAULT_SYSTEM_PROMPT
-        tools = self.mcp_client.get_tools_for_claude()
+        # The caller's history may be shared (Database caches it); copy once and extend in place
+        messages = list(messages)
 
-        # Initial Claude API call
-        rate_limit_info = None
-        try:
-            raw_response = await self.client.messages.with_raw_response.create(
-                model=model,
-                max_tokens=4096,
-                system=system_prompt,
-                tools=tools,
-                messages=messages,
-            )
-            response = raw_response.parse()
-
-            # Capture rate limit headers
-            headers = raw_response.headers
-            rate_limit_info = {
-                "input_tokens_limit": headers.get("anthropic-ratelimit-input-tokens-limit"),
-                "input_tokens_remaining": headers.get("anthropic-ratelimit-input-tokens-remaining"),
-                "input_tokens_reset": headers.get("anthropic-ratelimit-input-tokens-reset"),
-            }
-        except anthropic.RateLimitError as e:
-            # Log rate limit details from response headers
-            if hasattr(e, 'response') and e.response:
-                headers = e.response.headers
-                logger.error(
-                    f"Rate limit exceeded. "
-                    f"Input tokens limit: {headers.get('anthropic-ratelimit-input-tokens-limit', 'unknown')}, "
-                    f"Input tokens remaining: {headers.get('anthropic-ratelimit-input-tokens-remaining', 'unknown')}, "
-                    f"Input tokens reset: {headers.get('anthropic-ratelimit-input-tokens-reset', 'unknown')}, "
-                    f"Retry-After: {headers.get('retry-after', 'unknown')} seconds"
-                )
-            raise
-        except anthropic.APIConnectionError as e:
-            logger.error(f"Anthropic API connection failed: {e.__cause__}")
-            raise
+        # Tools and system prompt are identical across requests; mark them for prompt caching
+        system = self._get_system(system_prompt)
+        tools = self._get_tools()
 
-        # Handle tool use loop
         tool_calls = []
         chart_urls = []  # Collect chart URLs from tool results
+        text_parts = []  # Text of each turn; the client shows all of it as it streams, so all of it is kept
         total_input_tokens = 0
         total_output_tokens = 0
+        # The history is estimated once; later tool-loop turns only add the messages they append
+        estimated_tokens = self._estimate_prefix_tokens(model, system_prompt, system, tools) + estimate_tokens(messages)
 
-        # Track usage from initial response
-        if hasattr(response, 'usage'):
-            total_input_tokens += response.usage.input_tokens
-            total_output_tokens += response.usage.output_tokens
+        while True:
+            response, rate_limit_info, pending_tools = await self._stream_turn_with_retry(
+                estimated_tokens, model, system, tools, messages, on_tool_call, on_text
+            )
 
-        while response.stop_reason == "tool_use":
-            # Extract tool use blocks
-            tool_use_blocks = [block for block in response.content if block.type == "tool_use"]
+            # Track usage from this turn
+            if hasattr(response, "usage"):
+                total_input_tokens += response.usage.input_tokens
+                total_output_tokens += response.usage.output_tokens
+                self._note_prefix_cache(model, system_prompt, response.usage)
 
-            # Execute each tool call
-            tool_results = []
-            for tool_use in tool_use_blocks:
-                tool_name = tool_use.name
-                tool_input = tool_use.input
-
-                if on_tool_call:
-                    on_tool_call(tool_name, tool_input)
-
-                tool_calls.append({"name": tool_name, "input": tool_input})
-
-                try:
-                    result = await self.mcp_client.call_tool(tool_name, tool_input)
-                    # Extract content from MCP result
-                    tool_result_content = ""
-                    if hasattr(result, "content") and result.content:
-                        for content_item in result.content:
-                            if hasattr(content_item, "text"):
-                                text = content_item.text
-                                # Check if this content block contains a chart_url
-                                chart_url = extract_chart_url(text)
-                                if chart_url:
-                                    # Store URL for frontend, don't pass to LLM
-                                    chart_urls.append(chart_url)
-                                else:
-                                    # Pass text summary to LLM
-                                    tool_result_content += text
-                            else:
-                                tool_result_content += str(content_item)
-                    else:
-                        tool_result_content = str(result)
-                except Exception as e:
-                    logger.error(f"Tool {tool_name} failed: {e}")
-                    tool_result_content = f"Error: {str(e)}"
+            turn_text = "".join(block.text for block in response.content if block.type == "text")
+            if turn_text:
+                text_parts.append(turn_text)
 
+            if response.stop_reason != "tool_use":
+                _cancel_tools(pending_tools)
+                break
+
+            # Tool calls have been running since the stop reason arrived; gather preserves tool_use order
+            outcomes = await asyncio.gather(*(task for _, task in pending_tools))
+            tool_results = []
+            for (tool_use, _), (tool_result_content, tool_chart_urls) in zip(pending_tools, outcomes, strict=True):
+                tool_calls.append({"name": tool_use.name, "input": tool_use.input})
+                chart_urls.extend(tool_chart_urls)
                 tool_results.append(
                     {
                         "type": "tool_result",
@@ -186,54 +287,18 @@ class ChatService:
                 )
 
             # Continue conversation with tool results
-            messages = messages + [
+            new_messages = [
                 {"role": "assistant", "content": response.content},
                 {"role": "user", "content": tool_results},
             ]
-
-            try:
-                raw_response = await self.client.messages.with_raw_response.create(
-                    model=model,
-                    max_tokens=4096,
-                    system=system_prompt,
-                    tools=tools,
-                    messages=messages,
-                )
-                response = raw_response.parse()
-
-                # Update rate limit info from latest response
-                headers = raw_response.headers
-                rate_limit_info = {
-                    "input_tokens_limit": headers.get("anthropic-ratelimit-input-tokens-limit"),
-                    "input_tokens_remaining": headers.get("anthropic-ratelimit-input-tokens-remaining"),
-                    "input_tokens_reset": headers.get("anthropic-ratelimit-input-tokens-reset"),
-                }
-            except anthropic.RateLimitError as e:
-                # Log rate limit details from response headers
-                if hasattr(e, 'response') and e.response:
-                    headers = e.response.headers
-                    logger.error(
-                        f"Rate limit exceeded in tool loop. "
-                        f"Input tokens limit: {headers.get('anthropic-ratelimit-input-tokens-limit', 'unknown')}, "
-                        f"Input tokens remaining: {headers.get('anthropic-ratelimit-input-tokens-remaining', 'unknown')}, "
-                        f"Input tokens reset: {headers.get('anthropic-ratelimit-input-tokens-reset', 'unknown')}, "
-                        f"Retry-After: {headers.get('retry-after', 'unknown')} seconds"
-                    )
-                raise
-
-            # Track usage from tool loop response
-            if hasattr(response, 'usage'):
-                total_input_tokens += response.usage.input_tokens
-                total_output_tokens += response.usage.output_tokens
-
-        # Extract final text response
-        text_content = ""
-        for block in response.content:
-            if hasattr(block, "text"):
-                text_content += block.text
+            messages.extend(new_messages)
+            # The API reported what this turn's request cost against the limit; the next one only adds
+            # new_messages (the cached system+tools prefix is read from the cache and isn't charged)
+            estimated_tokens = _rate_limited_input_tokens(response.usage) + estimate_tokens(new_messages)
 
         return {
-            "content": text_content,
+            # Turns are separated the way chat.js separates them on a turn event
+            "content": "\n\n".join(text_parts),
             "tool_calls": tool_calls,
             "chart_urls": chart_urls,
             "usage": {
@@ -244,20 +309,273 @@ class ChatService:
             "rate_limit": rate_limit_info,
         }
 
-    def format_messages_for_claude(self, db_messages: list[dict]) -> list[dict]:
-        """Convert database messages to Claude API format, stripping images to save tokens."""
-        claude_messages = []
-        for msg in db_messages:
-            content = msg["content"]
-
-            # Strip base64 image data URLs from content to save tokens (legacy)
-            # Pattern: ![Chart](data:image/...;base64,<long base64 string>)
-            content = re.sub(r'!\[Chart\]\(data:image/[^;]+;base64,[^\)]+\)\s*', '', content)
-
-            claude_messages.append(
-                {
-                    "role": msg["role"],
-                    "content": content,
-                }
+    def _get_system(self, system_prompt: str) -> list[dict]:
+        """System prompt as a prompt-cached text block, reused until the prompt setting changes."""
+        if self._system_cached is None or self._system_cached[0] != system_prompt:
+            self._system_cached = (
+                system_prompt,
+                [{"type": "text", "text": system_prompt, "cache_control": EPHEMERAL_CACHE}],
             )
-        return claude_messages
+        return self._system_cached[1]
+
+    def _estimate_prefix_tokens(self, model: str, system_prompt: str, system: list[dict], tools: list[dict]) -> int:
+        """Rate-limit charge for the invariant system+tools prefix, computed once per distinct prefix.
+
+        Zero while the prefix is known to be in the prompt cache, since cache reads don't count
+        toward the input-tokens-per-minute limit.
+        """
+        if self._prefix_warm is not None:
+            warm_key, warm_until = self._prefix_warm
+            if warm_key == (model, system_prompt, self._tools_version) and time.monotonic() < warm_until:
+                return 0
+        key = (system_prompt, self._tools_version)
+        if self._prefix_tokens_cached is None or self._prefix_tokens_cached[0] != key:
+            self._prefix_tokens_cached = (key, estimate_tokens([system, tools]))
+        return self._prefix_tokens_cached[1]
+
+    def _note_prefix_cache(self, model: str, system_prompt: str, usage: Any):
+        """Record that a request read or wrote the prefix cache (prefixes too short to cache never do)."""
+        if (usage.cache_read_input_tokens or 0) + (usage.cache_creation_input_tokens or 0) > 0:
+            self._prefix_warm = ((model, system_prompt, self._tools_version), time.monotonic() + PROMPT_CACHE_TTL)
+
+    def _get_tools(self) -> list[dict]:
+        """Claude tool definitions with a prompt-cache marker on the last tool.
+
+        Rebuilt only when the MCP client's tool list changes (i.e. on (re)connect).
+        """
+        if self._tools_cached is None or self._tools_version != self.mcp_client.tools_version:
+            tools = self.mcp_client.get_tools_for_claude()
+            self._tools_cached = [*tools[:-1], {**tools[-1], "cache_control": EPHEMERAL_CACHE}] if tools else []
+            self._tools_version = self.mcp_client.tools_version
+        return self._tools_cached
+
+    async def _stream_turn_with_retry(
+        self,
+        estimated_tokens: int,
+        model: str,
+        system: list[dict],
+        tools: list[dict],
+        messages: list[dict],
+        on_tool_call: Callable[[str, Any], None] | None,
+        on_text: Callable[[str], None] | None,
+    ) -> tuple[Any, dict, list[tuple[Any, asyncio.Task[tuple[str, list[str]]]]]]:
+        """Run _stream_turn within the client-side token budget, retrying 429s with backoff."""
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            await self.rate_limiter.acquire(estimated_tokens)
+            try:
+                result = await self._stream_turn(model, system, tools, messages, on_tool_call, on_text)
+            except anthropic.RateLimitError as e:
+                if attempt == RATE_LIMIT_MAX_RETRIES:
+                    raise
+                self.rate_limiter.drain()
+                delay = _to_int(e.response.headers.get("retry-after")) or RATE_LIMIT_BASE_DELAY * 2**attempt
+                delay += random.uniform(0, delay / 2)
+                logger.warning(f"Rate limited, retrying in {delay:.1f}s ({attempt + 1}/{RATE_LIMIT_MAX_RETRIES})")
+                await asyncio.sleep(delay)
+                continue
+            self.rate_limiter.update(result[1])
+            return result
+
+    async def _stream_turn(
+        self,
+        model: str,
+        system: list[dict],
+        tools: list[dict],
+        messages: list[dict],
+        on_tool_call: Callable[[str, Any], None] | None,
+        on_text: Callable[[str], None] | None,
+    ) -> tuple[Any, dict, list[tuple[Any, asyncio.Task[tuple[str, list[str]]]]]]:
+        """Stream one Claude response, starting its tool calls as soon as it stops for tool use.
+
+        Completed tool_use blocks are held until message_delta gives the stop reason: on any other
+        stop (e.g. max_tokens, where the last block's input may be truncated) none of them is used,
+        so none is started or reported through on_tool_call.
+
+        Returns:
+            The final message, rate limit info from the response headers, and the started
+            tool calls as (tool_use block, task) pairs in the order Claude emitted them.
+        """
+        tool_uses = []
+        pending_tools = []
+        try:
+            async with self.client.messages.stream(
+                model=model,
+                max_tokens=4096,
+                system=system,
+                tools=tools,
+                messages=messages,
+            ) as stream:
+                async for event in stream:
+                    if event.type == "text":
+                        if on_text:
+                            on_text(event.text)
+                    elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                        tool_uses.append(event.content_block)
+                    elif event.type == "message_delta" and event.delta.stop_reason == "tool_use":
+                        for tool_use in tool_uses:
+                            if on_tool_call:
+                                on_tool_call(tool_use.name, tool_use.input)
+                            task = asyncio.create_task(self._run_tool(tool_use.name, tool_use.input))
+                            pending_tools.append((tool_use, task))
+
+                response = await stream.get_final_message()
+                headers = stream.response.headers
+        except anthropic.RateLimitError as e:
+            _cancel_tools(pending_tools)
+            # Log rate limit details from response headers
+            if hasattr(e, "response") and e.response:
+                headers = e.response.headers
+                logger.error(
+                    f"Rate limit exceeded. "
+                    f"Input tokens limit: {headers.get('anthropic-ratelimit-input-tokens-limit', 'unknown')}, "
+                    f"Input tokens remaining: {headers.get('anthropic-ratelimit-input-tokens-remaining', 'unknown')}, "
+                    f"Input tokens reset: {headers.get('anthropic-ratelimit-input-tokens-reset', 'unknown')}, "
+                    f"Retry-After: {headers.get('retry-after', 'unknown')} seconds"
+                )
+            raise
+        except anthropic.APIConnectionError as e:
+            _cancel_tools(pending_tools)
+            logger.error(f"Anthropic API connection failed: {e.__cause__}")
+            raise
+        except BaseException:
+            _cancel_tools(pending_tools)
+            raise
+
+        # Capture rate limit headers
+        rate_limit_info = {
+            "input_tokens_limit": headers.get("anthropic-ratelimit-input-tokens-limit"),
+            "input_tokens_remaining": headers.get("anthropic-ratelimit-input-tokens-remaining"),
+            "input_tokens_reset": headers.get("anthropic-ratelimit-input-tokens-reset"),
+        }
+        return response, rate_limit_info, pending_tools
+
+    async def _run_tool(self, tool_name: str, tool_input: Any) -> tuple[str, list[str]]:
+        """Call an MCP tool and split its result into text for Claude and chart URLs for the frontend.
+
+        Failures are returned as an error string so one failing tool doesn't abort the others.
+        """
+        chart_urls = []
+        try:
+            result = await self.mcp_client.call_tool(tool_name, tool_input)
+            # Extract content from MCP result (pydantic models with a stable shape, so one
+            # attribute lookup per block; EAFP since nearly every block is text)
+            content_items = getattr(result, "content", None)
+            if content_items:
+                parts = []
+                for content_item in content_items:
+                    try:
+                        text = content_item.text
+                    except AttributeError:
+                        parts.append(str(content_item))
+                        continue
+                    # Check if this content block contains a chart_url
+                    chart_url = extract_chart_url(text)
+                    if chart_url:
+                        # Store URL for frontend, don't pass to LLM
+                        chart_urls.append(chart_url)
+                    else:
+                        # Pass text summary to LLM
+                        parts.append(text)
+                tool_result_content = "".join(parts)
+            else:
+                tool_result_content = str(result)
+        except Exception as e:
+            logger.error(f"Tool {tool_name} failed: {e}")
+            tool_result_content = f"Error: {str(e)}"
+        return tool_result_content, chart_urls
+
+    async def submit_batch(self, requests: list[dict]) -> str:
+        """
+        Submit requests to the Message Batches API.
+
+        Args:
+            requests: Batch requests, each {"custom_id": ..., "params": {...messages.create kwargs}}
+
+        Returns:
+            The batch ID, for use with poll_batch
+        """
+        batch = await self.client.messages.batches.create(requests=requests)
+        logger.info(f"Submitted message batch {batch.id} with {len(requests)} requests")
+        return batch.id
+
+    async def poll_batch(self, batch_id: str) -> dict[str, str] | None:
+        """
+        Fetch the results of a message batch.
+
+        Returns:
+            Response text keyed by custom_id once the batch has ended (failed requests are
+            omitted), or None while it is still processing
+        """
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return None
+
+        results = {}
+        async for entry in await self.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                text = "".join(block.text for block in entry.result.message.content if block.type == "text")
+                results[entry.custom_id] = text
+            else:
+                logger.warning(f"Batch {batch_id} request {entry.custom_id} {entry.result.type}")
+        return results
+
+
+class TitleBatcher:
+    """Generates conversation titles in the background through the Message Batches API.
+
+    Queued exchanges are submitted as one batch per interval, and finished batches are applied
+    with update_conversation_title, replacing the placeholder title set when the conversation
+    was created. Pending work is in memory only; after a restart the placeholder simply stays.
+    """
+
+    def __init__(self, chat_service: ChatService, db: Database):
+        self.chat_service = chat_service
+        self.db = db
+        self._queued: dict[str, tuple[str, dict]] = {}  # conversation_id -> (user_id, batch request)
+        self._batches: dict[str, dict[str, str]] = {}  # batch_id -> {conversation_id: user_id}
+
+    def enqueue(self, conversation_id: str, user_id: str, user_message: str, assistant_message: str):
+        """Queue title generation for a conversation's first exchange."""
+        prompt = f"{TITLE_PROMPT}\n\nUser: {user_message[:2000]}\n\nAssistant: {assistant_message[:2000]}"
+        request = {
+            "custom_id": conversation_id,
+            "params": {
+                "model": TITLE_MODEL,
+                "max_tokens": 32,
+                "messages": [{"role": "user", "content": prompt}],
+            },
+        }
+        self._queued[conversation_id] = (user_id, request)
+
+    async def flush(self):
+        """Submit queued requests and apply the titles from any finished batches."""
+        if self._queued:
+            queued, self._queued = self._queued, {}
+            try:
+                batch_id = await self.chat_service.submit_batch([request for _, request in queued.values()])
+            except Exception:
+                self._queued = queued | self._queued  # Retry on the next flush
+                raise
+            self._batches[batch_id] = {conversation_id: user_id for conversation_id, (user_id, _) in queued.items()}
+
+        for batch_id, owners in list(self._batches.items()):
+            results = await self.chat_service.poll_batch(batch_id)
+            if results is None:
+                continue
+            del self._batches[batch_id]
+            # Requests that failed are missing from results and keep their placeholder title
+            for conversation_id, title in results.items():
+                title = title.strip().strip('"')[:TITLE_MAX_LENGTH]
+                if title and conversation_id in owners:
+                    await self.db.update_conversation_title(
+                        conversation_id, owners[conversation_id], title, touch=False
+                    )
+
+    async def run(self, interval: float = TITLE_BATCH_INTERVAL):
+        """Flush periodically until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Title batch processing failed: {e}")
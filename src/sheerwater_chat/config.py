@@ -26,6 +26,12 @@ class Config:
     database_url: str
     base_url: str
 
+    # Connection pool bounds (used for PostgreSQL; SQLite opens a connection per query scope)
+    db_pool_min_size: int = 5
+    db_pool_max_size: int = 25
+    # Prepared statements cached per Postgres connection (0 when behind pgbouncer in transaction mode)
+    db_statement_cache_size: int = 1024
+
     @classmethod
     def from_env(cls) -> "Config":
         """Load configuration from environment variables."""
@@ -41,4 +47,7 @@ class Config:
             secret_key=os.environ["SECRET_KEY"],
             database_url=os.environ.get("DATABASE_URL", "sqlite:///./sheerwater_chat.db"),
             base_url=os.environ.get("BASE_URL", "http://localhost:8080"),
+            db_pool_min_size=int(os.environ.get("DB_POOL_MIN_SIZE", "5")),
+            db_pool_max_size=int(os.environ.get("DB_POOL_MAX_SIZE", "25")),
+            db_statement_cache_size=int(os.environ.get("DB_STATEMENT_CACHE_SIZE", "1024")),
         )
@@ -0,0 +1,41 @@
+"""Coalescing of concurrent identical async reads."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class InflightCache:
+    """Share one in-flight fetch between concurrent callers asking for the same key.
+
+    Nothing is kept once the fetch completes; this only collapses bursts (e.g. several tabs
+    loading at once) into a single upstream call. Results are shared and must not be mutated.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Await the fetch already running for key, or start one."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_task(key, done))
+        # Shielded so a cancelled caller doesn't cancel the fetch for everyone else waiting on it
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable):
+        """Stop sharing the fetch running for key (after a write, later callers must read afresh)."""
+        self._inflight.pop(key, None)
+
+    def forget_where(self, match: Callable[[Hashable], bool]):
+        """Like forget, for every key that match() accepts."""
+        for key in [key for key in self._inflight if match(key)]:
+            del self._inflight[key]
+
+    def _forget_task(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
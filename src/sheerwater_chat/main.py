@@ -1,23 +1,34 @@
 """FastAPI application for sheerwater-chat."""
 
+import asyncio
 import logging
 import os
-import uuid
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any
 
+import orjson
 from fastapi import Depends, FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from pydantic import BaseModel, ConfigDict
 from starlette.middleware.sessions import SessionMiddleware
 
-from .auth import create_oauth, get_user_from_session, get_user_id, get_user_name
-from .chat import DEFAULT_MODEL, DEFAULT_SYSTEM_PROMPT, ChatService
+from .auth import (
+    create_oauth,
+    get_session_user,
+    get_user_from_session,
+    get_user_id,
+    prefetch_jwks,
+    session_user_claims,
+)
+from .chat import DEFAULT_MODEL, DEFAULT_SYSTEM_PROMPT, ChatService, TitleBatcher, create_anthropic_client
 from .config import Config
-from .database import Database
+from .database import Database, uuid7
 from .mcp_client import McpClient
+from .middleware import RequestTimingMiddleware
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,51 +43,86 @@ if GIT_SHA != "unknown" and BUILD_TIMESTAMP != "unknown":
 else:
     APP_VERSION = "unknown"
 
+# Re-check template files for changes on every render (dev only; docker-compose turns it on)
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "false").lower() in ("1", "true", "yes")
+
 # Global instances
 config: Config = None
 db: Database = None
 mcp_client: McpClient = None
 chat_service: ChatService = None
+title_batcher: TitleBatcher = None
 oauth = None
+background_tasks: set[asyncio.Task] = set()  # Strong references so running tasks aren't garbage collected
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    global config, db, mcp_client, chat_service, oauth
+    global config, db, mcp_client, chat_service, title_batcher, oauth
 
     config = Config.from_env()
-    db = Database(config.database_url)
+    db = Database(
+        config.database_url,
+        pool_min_size=config.db_pool_min_size,
+        pool_max_size=config.db_pool_max_size,
+        statement_cache_size=config.db_statement_cache_size,
+    )
     mcp_client = McpClient(config.mcp_server_url)
-    chat_service = ChatService(config.anthropic_api_key, mcp_client)
+    anthropic_client = create_anthropic_client(config.anthropic_api_key)
+    chat_service = ChatService(anthropic_client, mcp_client)
+    title_batcher = TitleBatcher(chat_service, db)
     oauth = create_oauth(config)
 
     # Connect to database
     await db.connect()
     logger.info("Connected to database")
 
+    await prefetch_jwks(oauth)
+
     # Connect to MCP server using proper async context management
     async with mcp_client.connection():
         logger.info("Connected to MCP server")
+        title_task = asyncio.create_task(title_batcher.run())
         yield
+        title_task.cancel()
 
-    # Cleanup database
+    # Cleanup database and the shared Anthropic connection pool
     await db.disconnect()
+    await anthropic_client.close()
 
 
-app = FastAPI(title="Sheerwater Chat", lifespan=lifespan)
+# JSON API responses are serialized with orjson; HTML routes set their own response class
+app = FastAPI(title="Sheerwater Chat", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Templates and static files
 BASE_DIR = Path(__file__).parent
-templates = Jinja2Templates(directory=BASE_DIR / "templates")
+# Compiled templates stay in memory (and in a bytecode cache across restarts) instead of being
+# stat'ed and re-parsed on each render
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(BASE_DIR / "templates"),
+        autoescape=True,
+        auto_reload=TEMPLATE_AUTO_RELOAD,
+        cache_size=400,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+)
 app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
+# /api/chat only responds once the whole reply (all tool turns) is done
+app.add_middleware(RequestTimingMiddleware, slow_exempt_paths=("/api/chat",))
+
 
+async def require_auth(request: Request):
+    """Dependency that requires authentication.
 
-def require_auth(request: Request):
-    """Dependency that requires authentication."""
+    Async so FastAPI runs it on the event loop rather than in the threadpool. The user is kept on
+    request.state for the auth helpers used later in the request.
+    """
     user = get_user_from_session(request)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
+    request.state.user = user
     return user
 
 
@@ -96,7 +142,8 @@ async def callback(request: Request):
     token = await oauth.keycloak.authorize_access_token(request)
     user_info = token.get("userinfo")
     if user_info:
-        request.session["user"] = dict(user_info)
+        # The full id_token claims (nonce, hashes, timestamps, ...) would be re-signed and sent on every request
+        request.session["user"] = session_user_claims(user_info)
     return RedirectResponse(url="/")
 
 
@@ -113,18 +160,17 @@ async def logout(request: Request):
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     """Main chat page."""
-    user = get_user_from_session(request)
-    if not user:
+    session_user = get_session_user(request)
+    if not session_user:
         return templates.TemplateResponse("login.html", {"request": request})
 
-    user_id = get_user_id(request)
-    conversations = await db.list_conversations(user_id)
+    conversations = await db.list_conversations(session_user.id)
 
     return templates.TemplateResponse(
         "chat.html",
         {
             "request": request,
-            "user_name": get_user_name(request),
+            "user_name": session_user.name,
             "conversations": conversations,
             "current_conversation": None,
             "messages": [],
@@ -136,20 +182,23 @@ async def index(request: Request):
 @app.get("/c/{conversation_id}", response_class=HTMLResponse)
 async def conversation_page(request: Request, conversation_id: str, user: dict = Depends(require_auth)):
     """View a specific conversation."""
-    user_id = get_user_id(request)
-    conversation = await db.get_conversation(conversation_id, user_id)
+    session_user = get_session_user(request)
+    user_id = session_user.id
+    # The three reads are independent; the messages of a conversation the user doesn't own are discarded
+    conversation, conversations, messages = await asyncio.gather(
+        db.get_conversation(conversation_id, user_id),
+        db.list_conversations(user_id),
+        db.get_messages(conversation_id),
+    )
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    conversations = await db.list_conversations(user_id)
-    messages = await db.get_messages(conversation_id)
-
     return templates.TemplateResponse(
         "chat.html",
         {
             "request": request,
-            "user_name": get_user_name(request),
+            "user_name": session_user.name,
             "conversations": conversations,
             "current_conversation": conversation,
             "messages": messages,
@@ -162,11 +211,17 @@ async def conversation_page(request: Request, conversation_id: str, user: dict =
 
 
 class SendMessageRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     message: str
     conversation_id: str | None = None
 
 
 class SendMessageResponse(BaseModel):
+    """Schema of the /api/chat reply (documentation only; the route returns the dict directly)."""
+
+    model_config = ConfigDict(frozen=True)
+
     conversation_id: str
     response: str
     tool_calls: list[dict]
@@ -175,11 +230,14 @@ class SendMessageResponse(BaseModel):
     rate_limit: dict | None = None
 
 
-@app.post("/api/chat", response_model=SendMessageResponse)
-async def send_chat_message(request: Request, body: SendMessageRequest, user: dict = Depends(require_auth)):
-    """Send a message and get a response."""
-    user_id = get_user_id(request)
+async def _prepare_chat(user_id: str, body: SendMessageRequest) -> tuple[str, dict, list[dict], str, str]:
+    """Resolve the conversation and load its history (plus the new user message) and settings.
+
+    The user message is not stored here; _send_to_claude stores it while Claude is already working.
 
+    Returns:
+        (conversation_id, conversation, claude_messages, model, system_prompt)
+    """
     # Get or create conversation
     if body.conversation_id:
         conversation = await db.get_conversation(body.conversation_id, user_id)
@@ -187,23 +245,40 @@ async def send_chat_message(request: Request, body: SendMessageRequest, user: di
             raise HTTPException(status_code=404, detail="Conversation not found")
         conversation_id = body.conversation_id
     else:
-        conversation_id = str(uuid.uuid4())
-        await db.create_conversation(conversation_id, user_id)
-
-    # Add user message to database
-    await db.add_message(conversation_id, "user", body.message)
-
-    # Get conversation history
-    db_messages = await db.get_messages(conversation_id)
-    claude_messages = chat_service.format_messages_for_claude(db_messages)
-
-    # Get runtime settings
-    model = await db.get_setting("model", DEFAULT_MODEL)
-    system_prompt = await db.get_setting("system_prompt", DEFAULT_SYSTEM_PROMPT)
-
-    # Send to Claude with MCP tools
-    result = await chat_service.send_message(claude_messages, model=model, system_prompt=system_prompt)
-
+        conversation_id = str(uuid7())
+        conversation = await db.create_conversation(conversation_id, user_id)
+
+    # Get conversation history and runtime settings concurrently
+    history, settings = await asyncio.gather(db.get_claude_messages(conversation_id), db.get_all_settings())
+    claude_messages = [*history, {"role": "user", "content": body.message}]
+    model = settings.get("model", DEFAULT_MODEL)
+    system_prompt = settings.get("system_prompt", DEFAULT_SYSTEM_PROMPT)
+    return conversation_id, conversation, claude_messages, model, system_prompt
+
+
+async def _send_to_claude(
+    conversation_id: str, body: SendMessageRequest, claude_messages: list[dict], **kwargs
+) -> dict:
+    """Store the user message and send the conversation to Claude concurrently.
+
+    Nothing in the Claude call reads the stored row, so the insert overlaps with generation instead
+    of delaying it. Both finish before the caller stores the reply, keeping the messages in order.
+    If the insert fails, the Claude call is cancelled rather than left generating a reply (and
+    running tools) that would never be stored.
+    """
+    claude_task = asyncio.create_task(chat_service.send_message(claude_messages, **kwargs))
+    try:
+        await db.add_message(conversation_id, "user", body.message)
+    except BaseException:
+        claude_task.cancel()
+        raise
+    return await claude_task
+
+
+async def _finish_chat(
+    user_id: str, conversation_id: str, conversation: dict, body: SendMessageRequest, result: dict
+) -> dict:
+    """Save the assistant response, title a new conversation, and build the API response (SendMessageResponse)."""
     # Save assistant response
     await db.add_message(
         conversation_id,
@@ -213,20 +288,106 @@ async def send_chat_message(request: Request, body: SendMessageRequest, user: di
         chart_urls=result["chart_urls"] if result["chart_urls"] else None,
     )
 
-    # Update conversation title if it's new
-    conversation = await db.get_conversation(conversation_id, user_id)
+    # Update conversation title if it's new (the row fetched or created above still says)
     if not conversation.get("title"):
-        # Use first ~50 chars of user message as title
+        # Use first ~50 chars of user message as title until the generated one arrives
         title = body.message[:50] + ("..." if len(body.message) > 50 else "")
         await db.update_conversation_title(conversation_id, user_id, title)
+        title_batcher.enqueue(conversation_id, user_id, body.message, result["content"])
+
+    return {
+        "conversation_id": conversation_id,
+        "response": result["content"],
+        "tool_calls": result["tool_calls"],
+        "chart_urls": result.get("chart_urls", []),
+        "usage": result.get("usage"),
+        "rate_limit": result.get("rate_limit"),
+    }
 
-    return SendMessageResponse(
-        conversation_id=conversation_id,
-        response=result["content"],
-        tool_calls=result["tool_calls"],
-        chart_urls=result.get("chart_urls", []),
-        usage=result.get("usage"),
-        rate_limit=result.get("rate_limit"),
+
+@app.post("/api/chat", response_model=SendMessageResponse)
+async def send_chat_message(request: Request, body: SendMessageRequest, user: dict = Depends(require_auth)):
+    """Send a message and get a response."""
+    user_id = get_user_id(request)
+    conversation_id, conversation, claude_messages, model, system_prompt = await _prepare_chat(user_id, body)
+
+    # Send to Claude with MCP tools
+    result = await _send_to_claude(conversation_id, body, claude_messages, model=model, system_prompt=system_prompt)
+
+    # Returned as a Response, so FastAPI skips re-validating and re-encoding it against response_model
+    return ORJSONResponse(await _finish_chat(user_id, conversation_id, conversation, body, result))
+
+
+def _sse(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Event."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+@app.post("/api/chat/stream")
+async def stream_chat_message(request: Request, body: SendMessageRequest, user: dict = Depends(require_auth)):
+    """Send a message and stream the response as Server-Sent Events.
+
+    Events: ``conversation`` (id, sent first), ``text`` (each text delta), ``tool_call`` (tool name
+    as each call starts), ``turn`` (text resumes in a new turn after tool calls, so the client can
+    separate it from the text before), then ``done`` with the same payload as /api/chat, or ``error``.
+    """
+    user_id = get_user_id(request)
+    # Runs before the stream starts, so a missing conversation is still a plain 404
+    conversation_id, conversation, claude_messages, model, system_prompt = await _prepare_chat(user_id, body)
+
+    events: asyncio.Queue[bytes | None] = asyncio.Queue()
+    # "text" once text has streamed, "tool_call" once a tool ran after it: next text starts a new turn
+    last_event = None
+
+    def on_tool_call(name, _input):
+        nonlocal last_event
+        if last_event == "text":
+            last_event = "tool_call"
+        events.put_nowait(_sse("tool_call", {"name": name}))
+
+    def on_text(text):
+        nonlocal last_event
+        if last_event == "tool_call":
+            events.put_nowait(_sse("turn", {}))
+        last_event = "text"
+        events.put_nowait(_sse("text", {"text": text}))
+
+    async def respond():
+        try:
+            result = await _send_to_claude(
+                conversation_id,
+                body,
+                claude_messages,
+                model=model,
+                system_prompt=system_prompt,
+                on_tool_call=on_tool_call,
+                on_text=on_text,
+            )
+            response = await _finish_chat(user_id, conversation_id, conversation, body, result)
+            events.put_nowait(_sse("done", response))
+        except Exception:
+            # Nothing awaits this task, so the failure is logged and reported here. The client only
+            # gets a generic message: exception text can carry upstream or database internals.
+            logger.exception(f"Streaming chat response failed for conversation {conversation_id}")
+            events.put_nowait(_sse("error", {"detail": "Failed to get a response"}))
+        finally:
+            events.put_nowait(None)
+
+    # Not tied to the response: if the client disconnects, the reply is still generated and saved
+    task = asyncio.create_task(respond())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+    async def event_stream():
+        yield _sse("conversation", {"conversation_id": conversation_id})
+        while (event := await events.get()) is not None:
+            yield event
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # X-Accel-Buffering stops the nginx ingress from holding events back until the reply completes
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -286,7 +447,15 @@ def run():
     # Add session middleware
     app.add_middleware(SessionMiddleware, secret_key=config.secret_key)
 
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # uvicorn's default loop/http ("auto") already pick uvloop and httptools from uvicorn[standard].
+    # Stay on a single worker: conversation caches, the rate limiter and the MCP session are in-process.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8080,
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+    )
 
 
 if __name__ == "__main__":
@@ -24,8 +24,10 @@ class McpClient:
         self.server_url = server_url
         self._session: ClientSession | None = None
         self._tools: list[Tool] = []
-        self._lock = asyncio.Lock()
-        self._connected = False
+        self.tools_version = 0  # Bumped whenever the tool list changes, so callers can cache derived data
+        self._claude_tools: tuple[dict, ...] = ()  # Claude-format _tools, rebuilt whenever _tools changes
+        self._lock = asyncio.Lock()  # Held only while connecting or tearing down
+        self._ready = asyncio.Event()  # Set while a usable session exists; checked lock-free
 
     @asynccontextmanager
     async def connection(self):
@@ -39,8 +41,8 @@ class McpClient:
     async def _connect(self):
         """Establish connection to MCP server."""
         async with self._lock:
-            if self._connected and self._session:
-                return  # Already connected
+            if self._ready.is_set():
+                return  # Already connected (possibly by a caller we waited behind)
 
             for attempt in range(MAX_CONNECT_RETRIES):
                 try:
@@ -58,8 +60,8 @@ class McpClient:
 
                     # Fetch available tools
                     tools_result = await session.list_tools()
-                    self._tools = tools_result.tools
-                    self._connected = True
+                    self._set_tools(tools_result.tools)
+                    self._ready.set()
                     logger.info(f"Connected to MCP server, found {len(self._tools)} tools")
                     return
 
@@ -71,12 +73,20 @@ class McpClient:
                         logger.error(f"Failed to connect to MCP server after {MAX_CONNECT_RETRIES} attempts")
                         raise
 
-    async def _reconnect(self):
-        """Reconnect to MCP server after connection loss."""
-        logger.warning("Attempting to reconnect to MCP server...")
+    async def _reconnect(self, failed_session: ClientSession | None):
+        """Reconnect to MCP server after connection loss on failed_session.
+
+        Tool calls run concurrently on one session, so several may fail on the same broken session.
+        Only the current session is torn down: if another call already replaced it, this just waits
+        for (or reuses) the new connection instead of closing a healthy one.
+        """
+        if self._session is failed_session:
+            logger.warning("Attempting to reconnect to MCP server...")
+            # Cleared before waiting for the lock so new calls stop using the broken session right away
+            self._ready.clear()
         async with self._lock:
-            # Clean up old connection
-            if self._session:
+            # Clean up old connection, unless someone else already did (or already reconnected)
+            if self._session is not None and self._session is failed_session:
                 try:
                     await self._session_context.__aexit__(None, None, None)
                 except Exception:
@@ -86,13 +96,21 @@ class McpClient:
                 except Exception:
                     pass
 
-            self._session = None
-            self._connected = False
-            self._tools = []
+                self._session = None
+                self._set_tools([])
 
         # Establish new connection
         await self._connect()
 
+    def _set_tools(self, tools: list[Tool]):
+        """Replace the tool list, with its Claude-format conversion and version, in one place."""
+        self._tools = tools
+        self._claude_tools = tuple(
+            {"name": tool.name, "description": tool.description or "", "input_schema": tool.inputSchema}
+            for tool in tools
+        )
+        self.tools_version += 1
+
     async def list_tools(self) -> list[Tool]:
         """Get available tools from the MCP server."""
         return self._tools
@@ -100,33 +118,30 @@ class McpClient:
     async def call_tool(self, name: str, arguments: dict[str, Any]) -> Any:
         """Call a tool on the MCP server with automatic reconnection."""
         for attempt in range(MAX_CALL_RETRIES):
-            if not self._connected or not self._session:
+            if not self._ready.is_set():
                 logger.warning("MCP not connected, attempting to connect...")
                 await self._connect()
 
             try:
-                logger.info(f"Calling MCP tool: {name} with arguments: {arguments}")
-                result = await self._session.call_tool(name, arguments)
-                logger.info(f"Tool {name} returned successfully")
+                # Per-call logs are debug-only: formatting the arguments on every call isn't free
+                logger.debug("Calling MCP tool: %s with arguments: %s", name, arguments)
+                session = self._session
+                result = await session.call_tool(name, arguments)
+                logger.debug("Tool %s returned successfully", name)
                 return result
 
             except (httpx.RemoteProtocolError, httpx.ReadError, httpx.ConnectError, EOFError, ConnectionError) as e:
                 logger.error(f"MCP connection error during tool call (attempt {attempt + 1}/{MAX_CALL_RETRIES}): {e}")
 
                 if attempt < MAX_CALL_RETRIES - 1:
-                    await self._reconnect()
+                    await self._reconnect(session)
                     await asyncio.sleep(1)  # Brief delay before retry
                 else:
                     raise RuntimeError(f"Failed to call tool {name} after {MAX_CALL_RETRIES} attempts") from e
 
-    def get_tools_for_claude(self) -> list[dict]:
-        """Convert MCP tools to Claude API tool format."""
-        claude_tools = []
-        for tool in self._tools:
-            claude_tool = {
-                "name": tool.name,
-                "description": tool.description or "",
-                "input_schema": tool.inputSchema,
-            }
-            claude_tools.append(claude_tool)
-        return claude_tools
+    def get_tools_for_claude(self) -> tuple[dict, ...]:
+        """MCP tools in Claude API tool format.
+
+        Converted once per (re)connect and shared by every request; callers must not mutate the dicts.
+        """
+        return self._claude_tools
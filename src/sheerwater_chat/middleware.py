@@ -0,0 +1,50 @@
+"""ASGI middleware for sheerwater-chat."""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_SECONDS = 5.0  # Requests slower than this are logged as warnings
+
+
+class RequestTimingMiddleware:
+    """Log method, path, status and time to first byte of each HTTP request.
+
+    Written as plain ASGI (not BaseHTTPMiddleware), so it adds no task group or
+    body streaming queue to the request; it only wraps ``send`` to see the status.
+
+    Timing stops at ``http.response.start``, so streamed bodies (Server-Sent Events) don't count.
+    Paths in ``slow_exempt_paths`` are expected to take long before responding (e.g. the
+    non-streaming chat route waits for the whole reply) and are never logged as slow.
+    """
+
+    def __init__(self, app, slow_exempt_paths: tuple[str, ...] = ()):
+        self.app = app
+        self.slow_exempt_paths = frozenset(slow_exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500  # Reported if the app fails before starting a response
+        elapsed = None
+
+        async def send_wrapper(message):
+            nonlocal status, elapsed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = time.perf_counter() - start
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if elapsed is None:
+                elapsed = time.perf_counter() - start
+            if elapsed >= SLOW_REQUEST_SECONDS and scope["path"] not in self.slow_exempt_paths:
+                logger.warning(f"Slow request: {scope['method']} {scope['path']} {status} in {elapsed:.2f}s")
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{scope['method']} {scope['path']} {status} in {elapsed * 1000:.1f}ms")
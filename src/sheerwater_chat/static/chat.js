@@ -157,7 +157,7 @@ form.addEventListener('submit', async (e) => {
     const loadingMsg = addMessage('assistant', 'Thinking', true);
 
     try {
-        const response = await fetch('/api/chat', {
+        const response = await fetch('/api/chat/stream', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
@@ -170,13 +170,46 @@ form.addEventListener('submit', async (e) => {
             throw new Error('Failed to send message');
         }
 
-        const data = await response.json();
+        // Show text as it streams in; the final message is rebuilt from the 'done' event
+        const loadingContent = loadingMsg.querySelector('.message-content');
+        let streamedText = '';
+        let renderPending = false;
+        let data = null;
+
+        await readEventStream(response, (event, payload) => {
+            if (event === 'conversation') {
+                // Update conversation ID for new conversations
+                if (!conversationIdInput.value) {
+                    conversationIdInput.value = payload.conversation_id;
+                    // Update URL without reload
+                    history.pushState({}, '', `/c/${payload.conversation_id}`);
+                }
+            } else if (event === 'turn') {
+                // Text resumes after tool calls; keep it apart from the previous turn's text
+                streamedText += '\n\n';
+            } else if (event === 'text') {
+                streamedText += payload.text;
+                // Re-render at most once per frame rather than on every delta
+                if (!renderPending) {
+                    renderPending = true;
+                    requestAnimationFrame(() => {
+                        renderPending = false;
+                        loadingMsg.classList.remove('loading');
+                        loadingContent.innerHTML = renderMarkdown(streamedText);
+                        messagesDiv.scrollTop = messagesDiv.scrollHeight;
+                    });
+                }
+            } else if (event === 'tool_call' && !streamedText) {
+                loadingContent.textContent = `Running ${payload.name}`;
+            } else if (event === 'done') {
+                data = payload;
+            } else if (event === 'error') {
+                throw new Error(payload.detail || 'Failed to get a response');
+            }
+        });
 
-        // Update conversation ID for new conversations
-        if (!conversationIdInput.value) {
-            conversationIdInput.value = data.conversation_id;
-            // Update URL without reload
-            history.pushState({}, '', `/c/${data.conversation_id}`);
+        if (!data) {
+            throw new Error('Response ended unexpectedly');
         }
 
         // Remove loading and add actual response
@@ -198,6 +231,31 @@ form.addEventListener('submit', async (e) => {
     }
 });
 
+// Read a Server-Sent Events response body, calling onEvent(event, data) for each event
+async function readEventStream(response, onEvent) {
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value;
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            for (const line of block.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+}
+
 // Add message to UI
 function addMessage(role, content, loading = false, toolCalls = null, usage = null, chartUrls = null) {
     const div = document.createElement('div');
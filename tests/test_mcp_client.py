@@ -0,0 +1,14 @@
+"""Tests for the MCP client module."""
+
+from sheerwater_chat import chat, main
+from sheerwater_chat.mcp_client import McpClient
+
+
+def test_mcp_client_has_reconnect():
+    assert hasattr(McpClient, "_reconnect")
+
+
+def test_mcp_client_is_single_implementation():
+    # main and chat must use the retry/reconnect client, not a copy of it
+    assert main.McpClient is McpClient
+    assert chat.McpClient is McpClient